@@ -3,28 +3,38 @@
 TimeBuddy - Modular AI Time Assistant
 Uses Router + 4 specialized bots (Create, Edit, Check, Other)
 """
-import re
 import logging
 import streamlit as st
-from datetime import datetime, timedelta
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from itertools import islice
 
 # Setup logger for debugging
 logger = logging.getLogger(__name__)
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+if not logging.getLogger().handlers:  # configure once, not on every script rerun
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
 
 # Core imports
 from core.contracts import BotRequest
 from core.llm import LLM
+from core.ui import (
+    TYPE_EMOJI_CAL, VIEW_TODAY, VIEW_WEEK, TASK_VIEWS,
+    WEEKDAY_ABBR, short_date, HELP_TEXT, WELCOME_HTML, VISIBLE_CHAT_MESSAGES
+)
 from core.state import (
-    ensure_session_defaults, now_local, today_local,
-    get_today_schedules, get_week_schedules, format_schedule_display,
-    schedules_snapshot_sorted, push_user, push_bot, try_handle_confirmation
+    ensure_session_defaults, now_local, today_local, tz_choices,
+    ScheduleIndex, TYPE_EMOJI, get_schedule_index,
+    format_schedule_row, update_schedule,
+    schedules_snapshot_sorted, push_user, push_bot, message_html,
+    recent_chat, clear_chat, try_handle_confirmation
 )
 
 # Brain imports
+from brain import Brain
 from brain.router import Router
 from brain.merge import handle_envelope
 from brain.bots.plan_create import CreateBot
@@ -40,239 +50,14 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# Custom CSS
-st.markdown("""
-<style>
-    :root {
-        --primary: #6366f1;
-        --primary-dark: #4f46e5;
-        --success: #10b981;
-    }
-
-    [data-testid="stSidebar"] {
-        display: none;
-    }
-
-    .top-nav {
-        background: linear-gradient(135deg, var(--primary) 0%, var(--primary-dark) 100%);
-        color: white;
-        padding: 1rem 1.5rem;
-        border-radius: 12px;
-        margin-bottom: 1.5rem;
-        box-shadow: 0 4px 12px rgba(99, 102, 241, 0.2);
-        display: flex;
-        align-items: center;
-        justify-content: space-between;
-    }
-
-    .top-nav-left {
-        display: flex;
-        align-items: center;
-        gap: 1.5rem;
-    }
-
-    .top-nav-center {
-        display: flex;
-        align-items: center;
-        gap: 1rem;
-    }
-
-    .top-nav-right {
-        display: flex;
-        align-items: center;
-        gap: 1rem;
-    }
-
-    .nav-title {
-        font-size: 1.5rem;
-        font-weight: 700;
-        margin: 0;
-    }
-
-    .nav-time {
-        font-size: 0.9rem;
-        opacity: 0.95;
-    }
-
-    .nav-icon {
-        cursor: pointer;
-        padding: 0.5rem;
-        border-radius: 8px;
-        transition: background 0.2s;
-    }
-
-    .nav-icon:hover {
-        background: rgba(255, 255, 255, 0.1);
-    }
-
-    .user-message {
-        background: linear-gradient(135deg, var(--primary) 0%, var(--primary-dark) 100%);
-        color: white;
-        padding: 0.75rem 1rem;
-        border-radius: 12px;
-        margin: 0.5rem 0;
-        margin-left: 20%;
-        word-wrap: break-word;
-        overflow-wrap: break-word;
-        max-width: 75%;
-    }
-
-    .bot-message {
-        background: #f1f5f9;
-        color: #0f172a;
-        padding: 0.75rem 1rem;
-        border-radius: 12px;
-        margin: 0.5rem 0;
-        margin-right: 20%;
-        word-wrap: break-word;
-        overflow-wrap: break-word;
-        max-width: 75%;
-    }
-
-    .task-card {
-        background: white;
-        border: 1px solid #e2e8f0;
-        border-radius: 12px;
-        padding: 1rem;
-        margin: 0.5rem 0;
-        transition: all 0.2s ease;
-    }
-
-    .task-card:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 4px 12px rgba(0, 0, 0, 0.1);
-    }
-
-    .section-header {
-        background: linear-gradient(135deg, #f8fafc 0%, #e2e8f0 100%);
-        padding: 1rem 1.5rem;
-        border-radius: 10px;
-        margin: 1rem 0 0.75rem 0;
-        border-left: 4px solid var(--primary);
-    }
-
-    .section-header h3 {
-        margin: 0;
-        color: var(--primary-dark);
-        font-size: 1.25rem;
-    }
-
-    /* Tab styling enhancements */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 0.5rem;
-        background: #f8fafc;
-        padding: 0.5rem;
-        border-radius: 10px;
-        margin-bottom: 1rem;
-    }
-
-    .stTabs [data-baseweb="tab"] {
-        height: 3rem;
-        padding: 0 2rem;
-        background: white;
-        border-radius: 8px;
-        border: 2px solid transparent;
-        color: #64748b;
-        font-weight: 600;
-        transition: all 0.3s ease;
-    }
-
-    .stTabs [data-baseweb="tab"]:hover {
-        background: linear-gradient(135deg, #f1f5f9 0%, #e2e8f0 100%);
-        color: var(--primary-dark);
-        transform: translateY(-2px);
-    }
-
-    .stTabs [aria-selected="true"] {
-        background: linear-gradient(135deg, var(--primary) 0%, var(--primary-dark) 100%) !important;
-        color: white !important;
-        border-color: var(--primary) !important;
-        box-shadow: 0 4px 12px rgba(99, 102, 241, 0.3);
-    }
-
-    /* Enhanced checkbox styling */
-    .stCheckbox {
-        padding: 0.25rem;
-    }
-
-    .stCheckbox > label > div {
-        background: #f8fafc;
-        border-radius: 6px;
-        padding: 0.5rem;
-        transition: all 0.2s ease;
-    }
-
-    .stCheckbox > label > div:hover {
-        background: #e2e8f0;
-        transform: scale(1.1);
-    }
-
-    /* Mobile responsive styles */
-    @media (max-width: 768px) {
-        .user-message {
-            margin-left: 10%;
-            max-width: 85%;
-        }
-
-        .bot-message {
-            margin-right: 10%;
-            max-width: 85%;
-        }
-
-        .top-nav {
-            padding: 0.75rem 1rem;
-            flex-direction: column;
-            gap: 0.5rem;
-        }
-
-        .nav-title {
-            font-size: 1.25rem;
-        }
-
-        /* Make calendar columns more compact on tablets */
-        [data-testid="column"] {
-            padding: 0.25rem !important;
-            font-size: 0.85rem;
-        }
-
-        /* Compact tabs on mobile */
-        .stTabs [data-baseweb="tab"] {
-            padding: 0 1rem;
-            font-size: 0.85rem;
-        }
-    }
-
-    @media (max-width: 480px) {
-        .user-message {
-            margin-left: 5%;
-            max-width: 90%;
-        }
-
-        .bot-message {
-            margin-right: 5%;
-            max-width: 90%;
-        }
-
-        /* Make calendar columns very compact on mobile */
-        [data-testid="column"] {
-            padding: 0.15rem !important;
-            font-size: 0.75rem;
-        }
-
-        /* Reduce font size for calendar items */
-        [data-testid="stMarkdownContainer"] p {
-            font-size: 0.75rem;
-            margin: 0.1rem 0;
-        }
+# Custom CSS (read and wrapped once per process)
+@st.cache_resource
+def load_css(path: str = "static/app.css") -> str:
+    """Load the app stylesheet as a ready-to-inject <style> block."""
+    with open(path, "r") as f:
+        return f"<style>{f.read()}</style>"
 
-        /* Make buttons more compact */
-        [data-testid="stButton"] button {
-            padding: 0.25rem 0.5rem;
-            font-size: 0.75rem;
-        }
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(load_css(), unsafe_allow_html=True)
 
 # Initialize session state
 ensure_session_defaults(st.session_state)
@@ -283,30 +68,98 @@ if not API_KEY:
     st.error("⚠️ GEMINI_API_KEY not set in Streamlit secrets.")
     st.stop()
 
-# Load system identity
-try:
-    with open("identity.txt", "r") as f:
-        system_identity = f.read()
-except FileNotFoundError:
-    system_identity = "You are TimeBuddy, a personal time assistant."
+# Overlap likely bot calls with the router's LLM tie-breaker (set false to run them strictly in sequence)
+speculative_setting = st.secrets.get("SPECULATIVE_BOTS", True)
+if isinstance(speculative_setting, str):
+    # Env-style secrets arrive as strings, and bool("false") is True
+    SPECULATIVE_BOTS = speculative_setting.strip().lower() not in ("false", "0", "no", "off", "")
+else:
+    SPECULATIVE_BOTS = bool(speculative_setting)
+
+# Load system identity (read from disk once per process; the str is immutable,
+# so share it via cache_resource rather than unpickling a copy per rerun)
+@st.cache_resource(show_spinner=False)
+def load_system_identity(path: str = "identity.txt") -> str:
+    """Load the shared system identity prompt."""
+    try:
+        with open(path, "r") as f:
+            return f.read()
+    except FileNotFoundError:
+        return "You are TimeBuddy, a personal time assistant."
+
+system_identity = load_system_identity()
 
 # Initialize LLM and bots
 @st.cache_resource
-def init_brain():
-    """Initialize the modular brain (Router + Bots)."""
-    llm = LLM(api_key=API_KEY)
-    router = Router(llm)
+def get_llm() -> LLM:
+    """The process-wide LLM client, shared by the brain and confirmation parsing."""
+    return LLM(api_key=API_KEY)
+
+
+@st.cache_resource
+def init_brain() -> Brain:
+    """Initialize the modular brain (Router + Bots) around the shared LLM."""
+    llm = get_llm()
     create_bot = CreateBot(llm)
     edit_bot = EditBot(llm)
     check_bot = CheckBot(llm)
-    other_bot = OtherBot(llm)
-    return llm, router, create_bot, edit_bot, check_bot, other_bot
+    return Brain(
+        llm=llm,
+        router=Router(llm),
+        create_bot=create_bot,
+        edit_bot=edit_bot,
+        check_bot=check_bot,
+        other_bot=OtherBot(llm),
+        bots={
+            "PLAN_CREATE": create_bot,
+            "PLAN_EDIT": edit_bot,
+            "PLAN_CHECK": check_bot,
+        }
+    )
+
+brain = init_brain()
+
+
+# Worker threads shared by all sessions; a slot is taken per speculative call
+SPECULATIVE_WORKERS = 4
+
+
+@st.cache_resource
+def get_bot_executor() -> tuple[ThreadPoolExecutor, threading.BoundedSemaphore]:
+    """Worker threads for bot calls that overlap the router's LLM tie-breaker, and their free slots."""
+    return (
+        ThreadPoolExecutor(max_workers=SPECULATIVE_WORKERS, thread_name_prefix="bot"),
+        threading.BoundedSemaphore(SPECULATIVE_WORKERS),
+    )
+
+
+def run_speculative_bot(bot_request: BotRequest):
+    """
+    Start EditBot while route() waits on its LLM tie-breaker, if the keywords
+    point to an edit. EditBot is the only routed bot that calls the model;
+    the others answer locally, so speculating on them saves nothing.
+
+    Bots only read the request and return an envelope, so a wrong guess is
+    simply discarded. Speculation is skipped when every worker is busy, so
+    it never queues behind (or ahead of) another session's call.
+
+    Returns:
+        (bot, future) for the guessed bot, or (None, None) when speculation is
+        off, not worthwhile, or no worker is free
+    """
+    if not SPECULATIVE_BOTS:
+        return None, None
+    guess = brain.router.tiebreak_guess(bot_request.user_text)
+    if guess is None or guess.stage != "PLAN_EDIT":
+        return None, None
 
-llm, router, create_bot, edit_bot, check_bot, other_bot = init_brain()
+    executor, free_slots = get_bot_executor()
+    if not free_slots.acquire(blocking=False):
+        return None, None
+    future = executor.submit(brain.edit_bot.run, bot_request)
+    future.add_done_callback(lambda _: free_slots.release())
+    return brain.edit_bot, future
 
-# Store LLM in session state for smart confirmation handling
-if 'llm' not in st.session_state:
-    st.session_state.llm = llm
 
 # Initialize modal states
 if 'show_analytics' not in st.session_state:
@@ -315,15 +168,7 @@ if 'show_help' not in st.session_state:
     st.session_state.show_help = False
 
 # Timezone selector (hidden, but functional)
-tz_options = [
-    "America/Phoenix", "America/Los_Angeles", "America/Denver",
-    "America/Chicago", "America/New_York", "Europe/London",
-    "Europe/Paris", "Asia/Tokyo", "Asia/Shanghai", "UTC"
-]
-
-current_tz = st.session_state.tz_name
-if current_tz not in tz_options:
-    tz_options = [current_tz] + tz_options
+tz_options, tz_index = tz_choices(st.session_state.tz_name)
 
 # Top Navigation Bar
 col_nav_left, col_nav_center, col_nav_right = st.columns([2, 3, 2])
@@ -340,15 +185,18 @@ with col_nav_center:
     selected_tz = st.selectbox(
         "Timezone",
         tz_options,
-        index=tz_options.index(current_tz),
+        index=tz_index,
         key="tz_selector",
         label_visibility="collapsed"
     )
     st.session_state.tz_name = selected_tz
 
+    # Read the clock once per full run (header and analytics share it)
+    now = now_local(st.session_state)
+
     st.markdown(f"""
     <div style="text-align: center; color: #64748b; font-size: 0.9rem; margin-top: -0.5rem;">
-        🕒 {now_local(st.session_state).strftime('%Y-%m-%d %H:%M')}
+        🕒 {now.strftime('%Y-%m-%d %H:%M')}
     </div>
     """, unsafe_allow_html=True)
 
@@ -368,32 +216,58 @@ st.divider()
 # Main layout - Chat (33%) | Tasks & Calendar (67%)
 col_left, col_right = st.columns([1, 2])
 
-with col_left:
+
+def render_history(slot):
+    """Draw the welcome message or the chat history (latest messages only) into slot."""
+    history = st.session_state.chat_history
+    if not history:
+        slot.markdown(WELCOME_HTML, unsafe_allow_html=True)
+        return
+    hidden = 0
+    if not st.session_state.get("show_older_chat"):
+        hidden = max(len(history) - VISIBLE_CHAT_MESSAGES, 0)
+    # One markdown element for the whole history instead of one per message;
+    # bubble HTML is rendered once when the message is pushed
+    slot.markdown(
+        "\n".join(
+            msg.get('html') or message_html(msg['role'], msg['content'])
+            for msg in islice(history, hidden, None)
+        ),
+        unsafe_allow_html=True
+    )
+
+
+def finish_chat_turn(version_before: int, history_slot):
+    """
+    Rerun the whole app if the message changed the schedules; otherwise just
+    redraw the chat history in place, with no rerun at all.
+    """
+    if st.session_state.version != version_before:
+        st.rerun()
+    render_history(history_slot)
+
+
+@st.fragment
+def chat_panel():
+    """
+    Chat history, input form and message handling.
+
+    Runs as a fragment so sending a message only re-renders the chat panel;
+    the task views rerun only when the schedules actually change.
+    """
     st.markdown("### 💬 Chat Assistant")
+
+    if len(st.session_state.chat_history) > VISIBLE_CHAT_MESSAGES:
+        if st.toggle("Show earlier messages", key="show_older_chat") and st.session_state.chat_archive_count:
+            st.caption(f"{st.session_state.chat_archive_count} older messages are no longer kept.")
     
     # Chat container - responsive height
     chat_container = st.container(height=500)
     with chat_container:
-        if not st.session_state.chat_history:
-            st.markdown("""
-            <div class="bot-message">
-            👋 Hi! I'm TimeBuddy, your personal time assistant. I can help you:
-            
-            • **Schedule tasks**: "Add team meeting tomorrow at 2pm"<br>
-            • **Edit plans**: "Move my workout to 7am"<br>
-            • **Check agenda**: "Show me today's schedule"
-            
-            What would you like to do?
-            </div>
-            """, unsafe_allow_html=True)
-        
-        for msg in st.session_state.chat_history:
-            if msg['role'] == 'user':
-                st.markdown(f'<div class="user-message">{msg["content"]}</div>', unsafe_allow_html=True)
-            else:
-                # Convert markdown **text** to HTML <strong>text</strong> for proper rendering
-                content = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', msg["content"])
-                st.markdown(f'<div class="bot-message">{content}</div>', unsafe_allow_html=True)
+        # Placeholders, so a chat turn can redraw in place instead of rerunning
+        history_slot = st.empty()
+        stream_slot = st.empty()
+    render_history(history_slot)
 
     # Input form
     with st.form(key="chat_form", clear_on_submit=True):
@@ -410,19 +284,21 @@ with col_left:
         send_button = st.form_submit_button("📤 Send", use_container_width=True)
     
     if st.button("🗑️ Clear Chat"):
-        st.session_state.chat_history = []
-        st.rerun()
+        clear_chat(st.session_state)
+        render_history(history_slot)
     
     if 'pending_message' in st.session_state:
         del st.session_state.pending_message
     
     # Process message
     if send_button and user_input.strip():
+        version_before = st.session_state.version
         push_user(st.session_state, user_input)
+        render_history(history_slot)
 
         # Try confirmation first
-        if try_handle_confirmation(st.session_state, user_input):
-            st.rerun()
+        if try_handle_confirmation(st.session_state, user_input, brain.llm):
+            finish_chat_turn(version_before, history_slot)
         else:
             # Show loading indicator while processing
             with st.spinner("🤔 Thinking..."):
@@ -434,93 +310,139 @@ with col_left:
                         tz_name=st.session_state.tz_name,
                         schedules_snapshot=schedules_snapshot_sorted(st.session_state),
                         system_identity=system_identity,
-                        chat_history=st.session_state.chat_history[-5:]
+                        chat_history=recent_chat(st.session_state)
                     )
 
-                    # Route to appropriate bot
-                    route_decision = router.route(
+                    # Route to appropriate bot, overlapping a likely bot call
+                    # with the LLM tie-breaker when there is one
+                    speculative_bot, speculative = run_speculative_bot(bot_request)
+                    route_decision = brain.router.route(
                         user_input,
                         awaiting_confirmation=st.session_state.awaiting_confirmation
                     )
 
                     # Call appropriate bot
-                    logger.info(f"🤖 Calling bot for stage: {route_decision.stage}")
-                    if route_decision.stage == "PLAN_CREATE":
-                        logger.info("   → CreateBot.run()")
-                        envelope = create_bot.run(bot_request)
-                    elif route_decision.stage == "PLAN_EDIT":
-                        logger.info("   → EditBot.run()")
-                        envelope = edit_bot.run(bot_request)
-                    elif route_decision.stage == "PLAN_CHECK":
-                        logger.info("   → CheckBot.run()")
-                        envelope = check_bot.run(bot_request)
+                    logger.info("🤖 Calling bot for stage: %s", route_decision.stage)
+                    bot = brain.bots.get(route_decision.stage)
+                    if speculative is not None and bot is not speculative_bot:
+                        speculative.cancel()  # Wrong guess; a running call is left to finish and dropped
+                        speculative = None
+                    if speculative is not None:
+                        logger.info("   → %s.run() (speculative)", type(bot).__name__)
+                        envelope = speculative.result()
+                    elif bot is not None:
+                        logger.info("   → %s.run()", type(bot).__name__)
+                        envelope = bot.run(bot_request)
                     else:  # OTHER
-                        logger.info("   → OtherBot.run()")
-                        envelope = other_bot.run(bot_request)
-                    logger.info(f"   ✅ Bot completed - returned envelope")
+                        # Free-form replies are streamed into the chat as they generate
+                        logger.info("   → OtherBot.run_stream()")
+                        with stream_slot:
+                            reply = st.write_stream(brain.other_bot.run_stream(bot_request))
+                        stream_slot.empty()  # The reply is redrawn as part of the history
+                        envelope = brain.other_bot.reply_envelope(reply)
+                    logger.info("   ✅ Bot completed - returned envelope")
 
                     # Apply envelope
-                    needs_rerun = handle_envelope(st.session_state, envelope)
+                    handle_envelope(st.session_state, envelope)
 
-                    if needs_rerun:
-                        st.rerun()
-                    else:
-                        st.rerun()  # Always rerun to show new message
+                    # Show the reply (full rerun only if schedules changed)
+                    finish_chat_turn(version_before, history_slot)
 
                 except Exception as e:
                     # Handle errors gracefully
                     error_msg = "😕 Oops! Something went wrong. Please try again or rephrase your request."
 
                     # Add more specific error messages for common issues
-                    if "API" in str(e) or "quota" in str(e).lower():
+                    detail = str(e)
+                    detail_lower = detail.lower()
+                    if "API" in detail or "quota" in detail_lower:
                         error_msg = "⚠️ AI service is temporarily unavailable. Please try again in a moment."
-                    elif "network" in str(e).lower() or "connection" in str(e).lower():
+                    elif "network" in detail_lower or "connection" in detail_lower:
                         error_msg = "📡 Network error. Please check your connection and try again."
 
                     push_bot(st.session_state, error_msg)
-                    st.rerun()
+                    finish_chat_turn(version_before, history_slot)
 
-with col_right:
-    # Tabbed View - Today | Week | Month
-    tab_today, tab_week, tab_month = st.tabs(["📋 Today", "📅 Week", "🗓️ Month"])
+
+with col_left:
+    chat_panel()
+
+
+TASK_COLUMNS = {
+    'completed': st.column_config.CheckboxColumn("✓", width="small"),
+    'task': st.column_config.TextColumn("Task"),
+    'time': st.column_config.TextColumn("Time"),
+}
+
+
+def apply_task_edits(editor_key: str, task_ids: list[str]):
+    """data_editor callback: save completed toggles before the rerun starts."""
+    for row, changes in st.session_state[editor_key]["edited_rows"].items():
+        if 'completed' in changes:
+            update_schedule(st.session_state, task_ids[row], {'completed': changes['completed']})
+
+
+def task_editor(tasks: list[dict], name: str):
+    """
+    Render tasks as one data_editor whose only editable column is 'completed'.
+
+    The key includes the schedules version, so the editor starts clean
+    whenever the schedules change instead of replaying stale edits.
+    """
+    key = f"tasks_{name}_{st.session_state.version}"
+    st.data_editor(
+        [format_schedule_row(t) for t in tasks],
+        column_config=TASK_COLUMNS,
+        disabled=("task", "time"),
+        hide_index=True,
+        use_container_width=True,
+        key=key,
+        on_change=apply_task_edits,
+        args=(key, [t['id'] for t in tasks])
+    )
+
+
+@st.fragment
+def tasks_panel():
+    """Today/Week/Month views; checkbox toggles rerun only this panel."""
+    # One clock read per panel run, shared by the index and every view
+    today = today_local(st.session_state)
+    schedule_index = get_schedule_index(st.session_state, today)
+
+    # View switcher - Today | Week | Month
+    # A radio rather than st.tabs: tabs run every body on each rerun, this
+    # renders only the selected view
+    view = st.radio(
+        "View",
+        TASK_VIEWS,
+        horizontal=True,
+        key="task_view",
+        label_visibility="collapsed"
+    )
 
     # ========== TODAY TAB ==========
-    with tab_today:
+    if view == VIEW_TODAY:
         st.markdown('<div class="section-header"><h3>Today\'s Tasks</h3></div>', unsafe_allow_html=True)
 
-        today_tasks = get_today_schedules(st.session_state)
+        today_tasks = schedule_index.today
 
         if today_tasks:
-            for task in sorted(today_tasks, key=lambda x: x['start_time']):
-                col1, col2 = st.columns([1, 4])
-                with col1:
-                    checked = st.checkbox("", value=task['completed'], key=f"cb_today_{task['id']}")
-                    if checked != task['completed']:
-                        task['completed'] = checked
-                        st.rerun()
-                with col2:
-                    st.markdown(format_schedule_display(task))
+            task_editor(today_tasks, "today")
         else:
             st.info("🎉 No tasks for today. Add one in the chat!")
 
     # ========== WEEK TAB ==========
-    with tab_week:
+    elif view == VIEW_WEEK:
         st.markdown('<div class="section-header"><h3>This Week\'s Tasks</h3></div>', unsafe_allow_html=True)
 
-        week_tasks = get_week_schedules(st.session_state)
-
-        if week_tasks:
-            by_date = {}
-            for t in week_tasks:
-                by_date.setdefault(t['date'], []).append(t)
+        by_date = schedule_index.week
 
-            for date_str in sorted(by_date.keys()):
-                date_obj = datetime.fromisoformat(date_str).date()
-                today = today_local(st.session_state)
+        if by_date:
+            for date_obj, day_tasks in by_date.items():
                 is_today = date_obj == today
 
                 # Stylized date header
-                date_label = "Today" if is_today else date_obj.strftime('%a, %b %d')
+                date_label = "Today" if is_today else f"{WEEKDAY_ABBR[date_obj.weekday()]}, {short_date(date_obj)}"
                 emoji_prefix = "📍 " if is_today else ""
 
                 st.markdown(f"""
@@ -529,38 +451,32 @@ with col_right:
                             border-radius: 8px;
                             margin: 0.5rem 0;
                             border-left: 3px solid {'var(--primary)' if is_today else '#cbd5e1'};">
-                    <strong>{emoji_prefix}{date_label}</strong> ({len(by_date[date_str])} tasks)
+                    <strong>{emoji_prefix}{date_label}</strong> ({len(day_tasks)} tasks)
                 </div>
                 """, unsafe_allow_html=True)
 
                 # Tasks for this date
-                for t in sorted(by_date[date_str], key=lambda x: x['start_time']):
-                    col1, col2 = st.columns([1, 10])
-                    with col1:
-                        checked = st.checkbox("", value=t['completed'], key=f"cb_week_{t['id']}")
-                        if checked != t['completed']:
-                            t['completed'] = checked
-                            st.rerun()
-                    with col2:
-                        st.markdown(format_schedule_display(t))
+                task_editor(day_tasks, f"week_{date_obj.isoformat()}")
 
                 st.markdown("")  # Spacing
         else:
             st.info("📅 No tasks this week. Start planning in the chat!")
 
     # ========== MONTH TAB ==========
-    with tab_month:
+    else:  # VIEW_MONTH
         st.markdown('<div class="section-header"><h3>Monthly Calendar (4 Weeks)</h3></div>', unsafe_allow_html=True)
 
-        today = today_local(st.session_state)
-
         # Start from the beginning of the current week
         start_week = today - timedelta(days=today.weekday())
 
-        # Generate 4 weeks of dates
+        # Generate 4 weeks of dates, with their ISO index keys computed once
+        month_dates = [start_week + timedelta(days=i) for i in range(28)]
+        month_iso = [d.isoformat() for d in month_dates]
+
         for week_num in range(4):
-            week_start = start_week + timedelta(weeks=week_num)
-            week_dates = [week_start + timedelta(days=i) for i in range(7)]
+            week_dates = month_dates[week_num * 7:(week_num + 1) * 7]
+            week_iso = month_iso[week_num * 7:(week_num + 1) * 7]
+            week_start = week_dates[0]
 
             # Week header with date range
             week_end = week_dates[-1]
@@ -572,7 +488,7 @@ with col_right:
                         margin: 1rem 0 0.5rem 0;
                         text-align: center;
                         font-weight: 600;">
-                Week {week_num + 1}: {week_start.strftime('%b %d')} - {week_end.strftime('%b %d, %Y')}
+                Week {week_num + 1}: {short_date(week_start)} - {short_date(week_end)}, {week_end.year}
             </div>
             """, unsafe_allow_html=True)
 
@@ -588,24 +504,25 @@ with col_right:
                                 border-radius: 6px;
                                 text-align: center;
                                 margin-bottom: 0.5rem;">
-                        <strong>{d.strftime('%a')}</strong><br>
-                        {'📍 ' if is_today else ''}{d.strftime('%d')}
+                        <strong>{WEEKDAY_ABBR[d.weekday()]}</strong><br>
+                        {'📍 ' if is_today else ''}{d.day:02d}
                     </div>
                     """, unsafe_allow_html=True)
 
             # Calendar content row
             cols = st.columns(7)
-            for i, d in enumerate(week_dates):
+            for i, day_iso in enumerate(week_iso):
                 with cols[i]:
-                    day_tasks = [s for s in st.session_state.schedules if s['date'] == d.isoformat()]
+                    day_tasks = schedule_index.by_date.get(day_iso)
 
                     if day_tasks:
-                        # Show tasks for this day
-                        for s in sorted(day_tasks, key=lambda x: x['start_time']):
-                            emoji = {'work': '🔵', 'meeting': '🟡', 'personal': '🟢', 'break': '⚪'}.get(s['type'], '⚫')
+                        # Show tasks for this day, as one markdown element per day
+                        cards = []
+                        for s in day_tasks:
+                            emoji = TYPE_EMOJI_CAL.get(s['type'], '⚫')
                             status_emoji = '✅' if s['completed'] else ''
 
-                            st.markdown(f"""
+                            cards.append(f"""
                             <div style="background: white;
                                         border: 1px solid #e2e8f0;
                                         border-radius: 6px;
@@ -614,8 +531,8 @@ with col_right:
                                         font-size: 0.85rem;">
                                 {emoji} <strong>{s['start_time'][:5]}</strong> {status_emoji}<br>
                                 <span style="color: #64748b;">{s['title'][:20]}</span>
-                            </div>
-                            """, unsafe_allow_html=True)
+                            </div>""")
+                        st.markdown("".join(cards), unsafe_allow_html=True)
                     else:
                         st.markdown("""
                         <div style="text-align: center;
@@ -628,100 +545,64 @@ with col_right:
 
             st.markdown("")  # Spacing between weeks
 
-# Analytics Modal
-if st.session_state.show_analytics:
-    @st.dialog("📊 Time Analytics", width="large")
-    def show_analytics_modal():
-        total = len(st.session_state.schedules)
-        completed = sum(1 for s in st.session_state.schedules if s['completed'])
-
-        st.markdown("### 📈 Overview")
-        col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            st.metric("Total Tasks", total)
-        with col2:
-            st.metric("Completed", completed)
-        with col3:
-            st.metric("Pending", total - completed)
-        with col4:
-            st.metric("Completion Rate", f"{(completed/total*100 if total else 0):.0f}%")
-
-        st.divider()
-
-        st.markdown("### 🏷️ Task Breakdown by Type")
-        types = {}
-        for s in st.session_state.schedules:
-            types[s['type']] = types.get(s['type'], 0) + 1
-
-        if types:
-            for t, c in types.items():
-                emoji = {'work': '💼', 'meeting': '🤝', 'personal': '🏃', 'break': '☕'}.get(t, '📅')
-                st.markdown(f"{emoji} **{t.capitalize()}**: {c} tasks")
-        else:
-            st.info("No tasks yet. Start adding tasks to see analytics!")
-
-        st.divider()
-
-        if st.button("Close", key="close_analytics", use_container_width=True):
-            st.session_state.show_analytics = False
-            st.rerun()
-
-    show_analytics_modal()
-
-# Help Modal
-if st.session_state.show_help:
-    @st.dialog("❓ Help & About", width="large")
-    def show_help_modal():
-        st.markdown("""
-        ### 🤖 About TimeBuddy
-
-        **TimeBuddy** is your AI-powered personal time assistant built with a modular architecture.
-
-        ---
 
-        ### 📝 How to Use
-
-        #### Creating Tasks:
-        - "Add team meeting tomorrow at 2pm"
-        - "Schedule workout at 7am for 1 hour"
-        - "Set up lunch with Sarah on Friday at noon"
-
-        #### Editing Tasks:
-        - "Move my workout to 8am"
-        - "Cancel the meeting"
-        - "Change the team meeting to 3pm"
-
-        #### Checking Schedule:
-        - "Show me today's schedule"
-        - "What's on this week?"
-        - "Do I have anything tomorrow?"
+with col_right:
+    tasks_panel()
 
-        ---
 
-        ### 🔧 Features
+# Analytics Modal
+@st.dialog("📊 Time Analytics", width="large")
+def show_analytics_modal(index: ScheduleIndex, total: int):
+    """Overview and per-type breakdown, read from the cached schedule index."""
+    completed = index.completed_count
+
+    st.markdown("### 📈 Overview")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Total Tasks", total)
+    with col2:
+        st.metric("Completed", completed)
+    with col3:
+        st.metric("Pending", total - completed)
+    with col4:
+        st.metric("Completion Rate", f"{(completed/total*100 if total else 0):.0f}%")
+
+    st.divider()
+
+    st.markdown("### 🏷️ Task Breakdown by Type")
+    types = index.type_counts
+
+    if types:
+        for t, c in types.most_common():
+            emoji = TYPE_EMOJI.get(t, '📅')
+            st.markdown(f"{emoji} **{t.capitalize()}**: {c} tasks")
+    else:
+        st.info("No tasks yet. Start adding tasks to see analytics!")
+
+    st.divider()
+
+    if st.button("Close", key="close_analytics", use_container_width=True):
+        st.session_state.show_analytics = False
+        st.rerun()
 
-        - **Smart AI Routing**: Automatically routes your requests to specialized bots
-        - **Natural Language**: Talk to TimeBuddy like a personal assistant
-        - **Multi-timezone Support**: Work across different time zones seamlessly
-        - **Task Management**: Create, edit, check, and complete tasks with ease
-        - **Visual Calendar**: See your week at a glance
 
-        ---
+# Help Modal
+@st.dialog("❓ Help & About", width="large")
+def show_help_modal():
+    """Static usage guide."""
+    st.markdown(HELP_TEXT)
 
-        ### ℹ️ System Information
+    st.divider()
 
-        - **Version:** 2.0 (Modular Architecture)
-        - **AI Engine:** Gemini AI
-        - **Framework:** Streamlit
-        - **Architecture:** Router + Specialized Bots (Create, Edit, Check, Other)
-        """)
+    if st.button("Close", key="close_help", use_container_width=True):
+        st.session_state.show_help = False
+        st.rerun()
 
-        st.divider()
 
-        if st.button("Close", key="close_help", use_container_width=True):
-            st.session_state.show_help = False
-            st.rerun()
+if st.session_state.show_analytics:
+    show_analytics_modal(get_schedule_index(st.session_state, now.date()), len(st.session_state.schedules))
 
+if st.session_state.show_help:
     show_help_modal()
 
 st.divider()
@@ -0,0 +1,24 @@
+# brain/__init__.py
+"""
+Brain: the Router and its specialized bots, wired to one shared LLM.
+Defined here rather than in app.py, which Streamlit re-executes on every rerun.
+"""
+from dataclasses import dataclass
+from core.llm import LLM
+from brain.router import Router
+from brain.bots.plan_create import CreateBot
+from brain.bots.plan_edit import EditBot
+from brain.bots.plan_check import CheckBot
+from brain.bots.other import OtherBot
+
+
+@dataclass(frozen=True, slots=True)
+class Brain:
+    """The shared LLM plus the Router and its bots."""
+    llm: LLM
+    router: Router
+    create_bot: CreateBot
+    edit_bot: EditBot
+    check_bot: CheckBot
+    other_bot: OtherBot
+    bots: dict  # Stage -> bot for the non-streaming stages
@@ -3,9 +3,16 @@
 Other Bot: Handles OTHER stage.
 Responds to help, settings, and meta requests.
 """
+import logging
+from typing import Iterator, Optional
 from core.contracts import BotRequest, BotEnvelope
 from core.llm import LLM
 
+# Setup logger for debugging
+logger = logging.getLogger(__name__)
+
+FALLBACK_REPLY = "I'm here to help you manage your schedule! What would you like to do?"
+
 
 class OtherBot:
     """Bot for handling meta requests (help, settings, etc)."""
@@ -39,46 +46,62 @@ class OtherBot:
         Returns:
             BotEnvelope with helpful response
         """
-        text_lower = request.user_text.lower()
-        
-        # Quick responses for common queries
-        if any(word in text_lower for word in ['help', 'how', 'what can']):
+        quick = self._quick_reply(request)
+        if quick:
             return BotEnvelope(
                 stage="OTHER",
-                user_facing=self._help_message(),
+                user_facing=quick,
                 ask_confirmation=False
             )
-        
-        if 'timezone' in text_lower or 'time zone' in text_lower:
-            return BotEnvelope(
-                stage="OTHER",
-                user_facing=f"Your current timezone is **{request.tz_name}**. You can change it in the sidebar settings. What would you like to schedule?",
-                ask_confirmation=False
-            )
-        
-        # Use LLM for other cases
-        prompt = f"""
-User message: "{request.user_text}"
-Current timezone: {request.tz_name}
-Current time: {request.now_iso}
-
-This is a meta/help request. Provide a brief, friendly response.
-Then redirect the user back to scheduling tasks.
-Keep it under 3 sentences.
-"""
 
         try:
             response = self.llm.generate(
                 system_instruction=self.identity,
-                prompt=prompt,
+                prompt=self._build_prompt(request),
                 temperature=0.6,
                 max_tokens=256
             )
         except Exception as e:
             response = ""
 
+        return self.reply_envelope(response)
+
+    def run_stream(self, request: BotRequest) -> Iterator[str]:
+        """
+        Process other/meta request, yielding the reply as it is generated.
+        
+        Args:
+            request: BotRequest with user input
+            
+        Yields:
+            Reply text chunks; pass the joined text to reply_envelope()
+        """
+        quick = self._quick_reply(request)
+        if quick:
+            yield quick
+            return
+
+        streamed = False
+        try:
+            for chunk in self.llm.generate_stream(
+                system_instruction=self.identity,
+                prompt=self._build_prompt(request),
+                temperature=0.6,
+                max_tokens=256
+            ):
+                streamed = True
+                yield chunk
+        except Exception:
+            # Keep whatever was already shown; the fallback covers an empty reply
+            logger.warning("OtherBot stream failed after %s", "partial output" if streamed else "no output", exc_info=True)
+
+        if not streamed:
+            yield FALLBACK_REPLY
+
+    def reply_envelope(self, response: str) -> BotEnvelope:
+        """Wrap a finished reply in an envelope."""
         if not response:
-            response = "I'm here to help you manage your schedule! What would you like to do?"
+            response = FALLBACK_REPLY
         
         return BotEnvelope(
             stage="OTHER",
@@ -86,6 +109,31 @@ Keep it under 3 sentences.
             user_facing=response,
             ask_confirmation=False
         )
+
+    def _quick_reply(self, request: BotRequest) -> Optional[str]:
+        """Canned responses for common queries, or None to ask the LLM."""
+        text_lower = request.user_text.lower()
+        
+        if any(word in text_lower for word in ['help', 'how', 'what can']):
+            return self._help_message()
+        
+        if 'timezone' in text_lower or 'time zone' in text_lower:
+            return f"Your current timezone is **{request.tz_name}**. You can change it in the sidebar settings. What would you like to schedule?"
+        
+        return None
+
+    def _build_prompt(self, request: BotRequest) -> str:
+        """Build the LLM prompt for a meta request."""
+        # Static instructions first, per-request details last (stable prefix)
+        return f"""
+This is a meta/help request. Provide a brief, friendly response.
+Then redirect the user back to scheduling tasks.
+Keep it under 3 sentences.
+
+Current timezone: {request.tz_name}
+Current time: {request.now_iso}
+User message: "{request.user_text}"
+"""
     
     def _help_message(self) -> str:
         """Return help message."""
@@ -3,9 +3,11 @@
 Check Bot: Handles PLAN_CHECK stage.
 Displays schedules in a clean, readable format.
 """
-from datetime import datetime, timedelta
+from collections import defaultdict
+from datetime import timedelta
 from core.contracts import BotRequest, BotEnvelope
 from core.llm import LLM
+from core.state import TYPE_EMOJI, parse_iso_date, schedules_between
 
 
 class CheckBot:
@@ -60,20 +62,19 @@ class CheckBot:
         # Filter schedules
         today = request.now_iso_as_dt.date()
         
+        # Snapshot is sorted by date, so date ranges are binary-search slices
         if scope == 'today':
-            filtered = [s for s in request.schedules_snapshot if s['date'] == today.isoformat()]
+            today_iso = today.isoformat()
+            filtered = schedules_between(request.schedules_snapshot, today_iso, today_iso)
             title = "📅 Today's Schedule"
         else:
             start_week = today - timedelta(days=today.weekday())
             end_week = start_week + timedelta(days=6)
-            filtered = []
-            for s in request.schedules_snapshot:
-                try:
-                    s_date = datetime.fromisoformat(s['date']).date()
-                    if start_week <= s_date <= end_week:
-                        filtered.append(s)
-                except:
-                    continue
+            filtered = schedules_between(
+                request.schedules_snapshot,
+                start_week.isoformat(),
+                end_week.isoformat()
+            )
             title = "📅 This Week's Schedule"
         
         if not filtered:
@@ -102,17 +103,17 @@ class CheckBot:
                     time_str += f" - {s['end_time']}"
                 lines.append(f"{status} {emoji} **{s['title']}** at {time_str}")
         else:
-            # Group by date
-            by_date = {}
+            # Group by date (the snapshot is date-sorted, so days come out in order)
+            by_date = defaultdict(list)
             for s in filtered:
-                by_date.setdefault(s['date'], []).append(s)
+                by_date[s['date']].append(s)
             
-            for date_str in sorted(by_date.keys()):
-                date_obj = datetime.fromisoformat(date_str).date()
+            for date_str, day_tasks in by_date.items():
+                date_obj = parse_iso_date(date_str)
                 day_name = date_obj.strftime("%A, %b %d")
                 lines.append(f"\n**{day_name}**")
                 
-                for s in by_date[date_str]:
+                for s in day_tasks:
                     emoji = self._get_emoji(s)
                     status = "✅" if s.get('completed') else "⏰"
                     time_str = s['start_time'][:5]  # HH:MM only
@@ -129,10 +130,4 @@ class CheckBot:
     
     def _get_emoji(self, schedule: dict) -> str:
         """Get emoji for schedule type."""
-        type_map = {
-            'work': '💼',
-            'meeting': '🤝',
-            'personal': '🏃',
-            'break': '☕'
-        }
-        return type_map.get(schedule.get('type', 'work'), '📅')
+        return TYPE_EMOJI.get(schedule.get('type', 'work'), '📅')
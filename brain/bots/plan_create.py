@@ -64,8 +64,8 @@ class CreateBot:
 
         # Use simple, reliable confirmation message
         # (LLM tends to rephrase titles incorrectly, so we skip it)
-        from datetime import datetime
-        date_obj = datetime.fromisoformat(date_str).date()
+        from datetime import date
+        date_obj = date.fromisoformat(date_str)
         friendly_date = date_obj.strftime("%A, %B %d, %Y")  # "Monday, October 21, 2025"
 
         confirmation_msg = f"I'll add **{title}** on {friendly_date} from {start_time} to {end_time} ({duration} minutes). Save this?"
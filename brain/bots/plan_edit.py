@@ -3,10 +3,16 @@
 Edit Bot: Handles PLAN_EDIT stage.
 Identifies target task and proposes changes.
 """
+from datetime import timedelta
 from core.contracts import BotRequest, BotEnvelope
 from core.llm import LLM
+from core.state import schedules_between
 from core.timeparse import parse_time_of_day, parse_duration_minutes, infer_date
 
+# Tasks listed in the LLM prompt: at most PROMPT_TASK_LIMIT, within PROMPT_WINDOW_DAYS of today
+PROMPT_TASK_LIMIT = 10
+PROMPT_WINDOW_DAYS = 14
+
 
 class EditBot:
     """Bot for editing existing tasks/schedules."""
@@ -30,6 +36,27 @@ class EditBot:
         except FileNotFoundError:
             return "Identify the most relevant task and propose ONE change. Ask for confirmation."
     
+    def _prompt_tasks(self, request: BotRequest) -> list[dict]:
+        """
+        Pick the tasks to show the LLM: upcoming ones first, then the most
+        recent past ones, all within PROMPT_WINDOW_DAYS of today.
+        """
+        snapshot = request.schedules_snapshot
+        today = request.now_iso_as_dt.date()
+        window = timedelta(days=PROMPT_WINDOW_DAYS)
+
+        tasks = schedules_between(
+            snapshot, today.isoformat(), (today + window).isoformat()
+        )[:PROMPT_TASK_LIMIT]
+        if len(tasks) < PROMPT_TASK_LIMIT:
+            past = schedules_between(
+                snapshot, (today - window).isoformat(), (today - timedelta(days=1)).isoformat()
+            )
+            tasks = past[len(tasks) - PROMPT_TASK_LIMIT:] + tasks
+
+        # Nothing nearby: fall back to the latest tasks on record
+        return tasks or snapshot[-PROMPT_TASK_LIMIT:]
+
     def run(self, request: BotRequest) -> BotEnvelope:
         """
         Process edit request.
@@ -50,16 +77,12 @@ class EditBot:
         # Use LLM to identify target and changes
         schedules_text = "\n".join([
             f"- ID: {s['id']}, Title: {s['title']}, Date: {s['date']}, Time: {s['start_time']}"
-            for s in request.schedules_snapshot[-10:]  # Last 10 for context
+            for s in self._prompt_tasks(request)
         ])
         
+        # Static instructions first, tasks and user text last (stable prefix)
         prompt = f"""
-User wants to edit a task. Here are their recent tasks:
-
-{schedules_text}
-
-User message: "{request.user_text}"
-
+User wants to edit a task.
 Identify the MOST relevant task and determine what change to make.
 Common actions: move time, change date, rename, delete, mark complete, extend duration.
 
@@ -69,6 +92,12 @@ Respond with JSON containing ONE of these:
 - Update: {{"action": "update", "id": "task_id", "changes": {{"start_time": "10:00"}}}}
 
 Only include fields that should change.
+
+Here are their recent tasks:
+
+{schedules_text}
+
+User message: "{request.user_text}"
 """
 
         try:
@@ -10,7 +10,31 @@ from core.llm import LLM
 
 # Setup logger for debugging
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
+
+# Keyword decisions at or above this confidence skip the LLM tie-breaker
+KEYWORD_CONFIDENCE = 0.7
+
+# Substring keywords per stage, built once rather than on every message
+STAGE_KEYWORDS = (
+    ("PLAN_CREATE", (
+        'add', 'schedule', 'create', 'plan', 'book', 'set up', 'set',
+        'block time', 'block', 'reminder', 'remind', 'new task', 'new'
+    )),
+    ("PLAN_EDIT", (
+        'move', 'reschedule', 'change', 'delay', 'extend', 'rename',
+        'delete', 'remove', 'cancel', 'shorten', 'postpone', 'shift',
+        'update', 'modify', 'edit', 'complete', 'done', 'finish'
+    )),
+    ("PLAN_CHECK", (
+        'show', "what's", 'view', 'list', 'display', 'see',
+        'agenda', 'calendar', 'schedule', 'due', 'upcoming',
+        'today', 'tomorrow', 'week', 'month', 'status'
+    )),
+    ("OTHER", (
+        'help', 'settings', 'timezone', 'about', 'how', 'what can',
+        'role', 'rules', 'explain', 'configure'
+    )),
+)
 
 
 class Router:
@@ -47,7 +71,7 @@ class Router:
             RouteDecision with stage and confidence
         """
         logger.info("=" * 60)
-        logger.info(f"🧭 ROUTER.route() called with: '{user_text}'")
+        logger.info("🧭 ROUTER.route() called with: '%s'", user_text)
 
         # Don't re-route if awaiting confirmation
         if awaiting_confirmation:
@@ -56,11 +80,11 @@ class Router:
 
         # Try keyword-based classification first
         keyword_decision = self._classify_by_keywords(user_text)
-        logger.info(f"   📝 Keyword decision: {keyword_decision.stage} (confidence: {keyword_decision.confidence:.2f})")
+        logger.info("   📝 Keyword decision: %s (confidence: %.2f)", keyword_decision.stage, keyword_decision.confidence)
 
         # If high confidence, use it
-        if keyword_decision.confidence >= 0.7:
-            logger.info(f"   ✅ High confidence - using keyword decision: {keyword_decision.stage}")
+        if keyword_decision.confidence >= KEYWORD_CONFIDENCE:
+            logger.info("   ✅ High confidence - using keyword decision: %s", keyword_decision.stage)
             return keyword_decision
 
         # Otherwise, use LLM tie-breaker
@@ -68,11 +92,22 @@ class Router:
         llm_decision = self._classify_by_llm(user_text)
 
         final_decision = llm_decision if llm_decision else keyword_decision
-        logger.info(f"   🎯 FINAL DECISION: {final_decision.stage} (confidence: {final_decision.confidence:.2f})")
+        logger.info("   🎯 FINAL DECISION: %s (confidence: %.2f)", final_decision.stage, final_decision.confidence)
         logger.info("=" * 60)
 
         return final_decision
     
+    def tiebreak_guess(self, user_text: str) -> Optional[RouteDecision]:
+        """
+        Keyword decision for messages that route() will send to the LLM.
+
+        Returns:
+            The keyword-only RouteDecision if it falls below KEYWORD_CONFIDENCE
+            (so route() will make a network call), otherwise None
+        """
+        decision = self._classify_by_keywords(user_text)
+        return decision if decision.confidence < KEYWORD_CONFIDENCE else None
+
     def _classify_by_keywords(self, text: str) -> RouteDecision:
         """
         Classify using keyword rules.
@@ -81,43 +116,11 @@ class Router:
             RouteDecision with confidence based on keyword matches
         """
         text_lower = text.lower()
-        
-        # PLAN_CREATE keywords
-        create_keywords = [
-            'add', 'schedule', 'create', 'plan', 'book', 'set up', 'set',
-            'block time', 'block', 'reminder', 'remind', 'new task', 'new'
-        ]
-        create_score = sum(1 for kw in create_keywords if kw in text_lower)
-        
-        # PLAN_EDIT keywords
-        edit_keywords = [
-            'move', 'reschedule', 'change', 'delay', 'extend', 'rename',
-            'delete', 'remove', 'cancel', 'shorten', 'postpone', 'shift',
-            'update', 'modify', 'edit', 'complete', 'done', 'finish'
-        ]
-        edit_score = sum(1 for kw in edit_keywords if kw in text_lower)
-        
-        # PLAN_CHECK keywords
-        check_keywords = [
-            'show', "what's", 'view', 'list', 'display', 'see',
-            'agenda', 'calendar', 'schedule', 'due', 'upcoming',
-            'today', 'tomorrow', 'week', 'month', 'status'
-        ]
-        check_score = sum(1 for kw in check_keywords if kw in text_lower)
-        
-        # OTHER keywords
-        other_keywords = [
-            'help', 'settings', 'timezone', 'about', 'how', 'what can',
-            'role', 'rules', 'explain', 'configure'
-        ]
-        other_score = sum(1 for kw in other_keywords if kw in text_lower)
-        
-        # Find highest score
+
+        # Score = number of a stage's keywords found in the text
         scores = [
-            (create_score, "PLAN_CREATE"),
-            (edit_score, "PLAN_EDIT"),
-            (check_score, "PLAN_CHECK"),
-            (other_score, "OTHER")
+            (sum(1 for kw in keywords if kw in text_lower), stage)
+            for stage, keywords in STAGE_KEYWORDS
         ]
         scores.sort(reverse=True)
         
@@ -140,17 +143,19 @@ class Router:
         Returns:
             RouteDecision or None if LLM fails
         """
+        # Static instructions first, user text last, so the request prefix
+        # stays byte-stable across turns (friendly to implicit prompt caching)
         prompt = f"""
-Classify this user message into ONE of these categories:
+Classify the user message into ONE of these categories:
 - PLAN_CREATE: User wants to add/schedule a new task or event
 - PLAN_EDIT: User wants to modify/delete an existing task
 - PLAN_CHECK: User wants to view their schedule/tasks
 - OTHER: Help, settings, or other meta requests
 
-User message: "{text}"
-
 Respond with ONLY a JSON object like:
 {{"stage": "PLAN_CREATE", "confidence": 0.9}}
+
+User message: "{text}"
 """
 
         try:
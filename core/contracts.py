@@ -29,7 +29,7 @@ class BotRequest:
     user_text: str
     now_iso: str  # ISO datetime string
     tz_name: str  # IANA timezone name
-    schedules_snapshot: list[dict]  # Current schedules
+    schedules_snapshot: list[dict]  # Current schedules, sorted by (date, start_time)
     system_identity: str  # Bot-specific identity/prompt
     chat_history: list[dict] = field(default_factory=list)  # Recent messages
     
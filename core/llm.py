@@ -5,27 +5,74 @@ Provides simple interface for generation and classification.
 """
 import json
 import logging
-from typing import Any, Optional
+import httpx
+from functools import lru_cache
+from typing import Any, Iterator, Optional
 from google import genai
 from google.genai import types
 
 # Setup logger for debugging
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
+
+# Upper bound for a single Gemini request, in milliseconds
+REQUEST_TIMEOUT_MS = 30_000
+
+# Connection pool for the shared client. httpx drops idle connections after 5s
+# by default, shorter than a typical pause between chat turns, so keep them
+# warm for a minute to skip the TCP/TLS handshake on the next message.
+CONNECTION_LIMITS = httpx.Limits(
+    max_keepalive_connections=8,
+    max_connections=16,
+    keepalive_expiry=60.0,
+)
+
+# HTTP/2 lets concurrent requests share one connection; httpx needs h2 for it
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+@lru_cache(maxsize=32)
+def _generation_config(
+    system_instruction: str,
+    temperature: float,
+    max_tokens: int
+) -> types.GenerateContentConfig:
+    """Build (once) the request config for a given identity and sampling setup."""
+    return types.GenerateContentConfig(
+        system_instruction=system_instruction,
+        temperature=temperature,
+        max_output_tokens=max_tokens,
+    )
 
 
 class LLM:
     """Wrapper around Google GenAI client for TimeBuddy."""
     
-    def __init__(self, api_key: str, model_name: str = "gemini-flash-lite-latest"):
+    def __init__(
+        self,
+        api_key: str,
+        model_name: str = "gemini-flash-lite-latest",
+        timeout_ms: int = REQUEST_TIMEOUT_MS
+    ):
         """
         Initialize LLM client.
         
         Args:
             api_key: Google AI API key
             model_name: Model to use (default: gemini-flash-lite-latest)
+            timeout_ms: Per-request timeout in milliseconds
         """
-        self.client = genai.Client(api_key=api_key)
+        # One pooled HTTP client, shared by the router and every bot
+        self.client = genai.Client(
+            api_key=api_key,
+            http_options=types.HttpOptions(
+                timeout=timeout_ms,
+                client_args={'http2': HTTP2_AVAILABLE, 'limits': CONNECTION_LIMITS},
+            ),
+        )
         self.model_name = model_name
     
     def generate(
@@ -47,16 +94,13 @@ class LLM:
         Returns:
             Generated text
         """
-        logger.info("🤖 LLM.generate() CALLED")
-        logger.info(f"   Model: {self.model_name}")
-        logger.info(f"   Prompt: {prompt[:100]}...")  # First 100 chars
-        logger.info(f"   Temperature: {temperature}")
-
-        config = types.GenerateContentConfig(
-            system_instruction=system_instruction,
-            temperature=temperature,
-            max_output_tokens=max_tokens,
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("🤖 LLM.generate() CALLED")
+            logger.info("   Model: %s", self.model_name)
+            logger.info("   Prompt: %s...", prompt[:100])  # First 100 chars
+            logger.info("   Temperature: %s", temperature)
+
+        config = _generation_config(system_instruction, temperature, max_tokens)
 
         response = self.client.models.generate_content(
             model=self.model_name,
@@ -64,9 +108,44 @@ class LLM:
             config=config,
         )
 
-        logger.info(f"   Response: {response.text[:100] if response.text else 'None'}...")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("   Response: %s...", response.text[:100] if response.text else 'None')
 
         return response.text if response.text else ""
+
+    def generate_stream(
+        self,
+        system_instruction: str,
+        prompt: str,
+        temperature: float = 0.4,
+        max_tokens: int = 1024
+    ) -> Iterator[str]:
+        """
+        Generate text response incrementally.
+
+        Args:
+            system_instruction: System-level instructions
+            prompt: User prompt
+            temperature: Sampling temperature
+            max_tokens: Maximum output tokens
+
+        Yields:
+            Text chunks as they arrive
+        """
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("🤖 LLM.generate_stream() CALLED")
+            logger.info("   Model: %s", self.model_name)
+            logger.info("   Prompt: %s...", prompt[:100])  # First 100 chars
+
+        config = _generation_config(system_instruction, temperature, max_tokens)
+
+        for chunk in self.client.models.generate_content_stream(
+            model=self.model_name,
+            contents=prompt,
+            config=config,
+        ):
+            if chunk.text:
+                yield chunk.text
     
     def classify_json(
         self,
@@ -85,20 +164,17 @@ class LLM:
         Returns:
             Parsed Python object (dict/list) or None if parsing fails
         """
-        logger.info("🔍 LLM.classify_json() CALLED")
-        logger.info(f"   Model: {self.model_name}")
-        logger.info(f"   Prompt: {prompt[:100]}...")  # First 100 chars
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("🔍 LLM.classify_json() CALLED")
+            logger.info("   Model: %s", self.model_name)
+            logger.info("   Prompt: %s...", prompt[:100])  # First 100 chars
 
         full_prompt = prompt
         if schema_hint:
             full_prompt = f"{prompt}\n\nExpected JSON format: {schema_hint}"
 
         # Use lower temperature for classification
-        config = types.GenerateContentConfig(
-            system_instruction=system_instruction,
-            temperature=0.2,
-            max_output_tokens=512,
-        )
+        config = _generation_config(system_instruction, 0.2, 512)
 
         try:
             response = self.client.models.generate_content(
@@ -121,12 +197,12 @@ class LLM:
                 text = text.replace("```json", "").replace("```", "").strip()
 
             result = json.loads(text)
-            logger.info(f"   ✅ Parsed JSON: {result}")
+            logger.info("   ✅ Parsed JSON: %s", result)
             return result
 
         except json.JSONDecodeError as e:
-            logger.error(f"   ❌ JSON parse error: {e}")
+            logger.error("   ❌ JSON parse error: %s", e)
             return None
         except Exception as e:
-            logger.error(f"   ❌ Error: {e}")
+            logger.error("   ❌ Error: %s", e)
             return None
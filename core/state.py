@@ -3,12 +3,19 @@
 State management for TimeBuddy session.
 Provides helpers for managing schedules, chat history, and confirmation flow.
 """
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass
 from datetime import datetime, date, timedelta
+from functools import lru_cache
 from typing import Optional
 from zoneinfo import ZoneInfo
+import sys
 import uuid
 import json
 import os
+import re
+import html
 from pathlib import Path
 
 
@@ -16,6 +23,47 @@ from pathlib import Path
 DATA_DIR = Path("data")
 SCHEDULES_FILE = DATA_DIR / "schedules.json"
 
+# Chat history cap (bots only ever see the last few messages)
+MAX_CHAT_HISTORY = 200
+
+# Recent messages handed to bots as conversation context
+CHAT_CONTEXT_WINDOW = 5
+
+# Event type -> emoji shown next to tasks
+TYPE_EMOJI = {
+    'work': '💼',
+    'meeting': '🤝',
+    'personal': '🏃',
+    'break': '☕'
+}
+
+# Confirmation replies, matched as prefixes of the lower-cased message
+YES_PREFIXES = ("yes", "y", "ok", "okay", "save", "confirm", "sure", "yep", "yeah", "👍", "✅")
+NO_PREFIXES = ("no", "n", "cancel", "nope", "nah", "nevermind", "👎", "❌")
+
+# Timezones offered in the header selector, and each one's position in it
+TZ_OPTIONS = (
+    "America/Phoenix", "America/Los_Angeles", "America/Denver",
+    "America/Chicago", "America/New_York", "Europe/London",
+    "Europe/Paris", "Asia/Tokyo", "Asia/Shanghai", "UTC"
+)
+_TZ_OPTION_INDEX = {tz: i for i, tz in enumerate(TZ_OPTIONS)}
+
+# Markdown **bold** -> <strong> for the HTML chat bubbles
+_BOLD_RE = re.compile(r'\*\*(.*?)\*\*')
+
+
+def schedule_sort_key(schedule: dict) -> tuple[str, str]:
+    """(date, start_time) ordering that st.session_state.schedules is kept in."""
+    return schedule.get('date', ''), schedule.get('start_time', '')
+
+
+@lru_cache(maxsize=512)
+def parse_iso_date(date_str: str) -> date:
+    """Date part of an ISO string, memoized (schedules share a small set of dates)."""
+    # datetime.fromisoformat also takes "2025-10-21T14:00" style values from LLM corrections
+    return datetime.fromisoformat(date_str).date()
+
 
 def ensure_data_dir():
     """Ensure data directory exists."""
@@ -52,7 +100,12 @@ def load_schedules() -> list[dict]:
     try:
         if SCHEDULES_FILE.exists():
             with open(SCHEDULES_FILE, 'r') as f:
-                return json.load(f)
+                schedules = json.load(f)
+            # Share one string per event type (as infer_event_type's literals are)
+            for s in schedules:
+                if isinstance(s.get('type'), str):
+                    s['type'] = sys.intern(s['type'])
+            return schedules
     except Exception as e:
         print(f"Error loading schedules: {e}")
     return []
@@ -124,10 +177,17 @@ def calculate_end_time(start_time: str, duration: int) -> str:
 def ensure_session_defaults(st_session_state):
     """Initialize session state with default values."""
     if 'schedules' not in st_session_state:
-        # Load schedules from persistent storage
-        st_session_state.schedules = load_schedules()
+        # Load schedules from persistent storage; add/update keep them sorted after this
+        st_session_state.schedules = sorted(load_schedules(), key=schedule_sort_key)
     if 'chat_history' not in st_session_state:
-        st_session_state.chat_history = []
+        # Capped deque: appending past MAX_CHAT_HISTORY drops the oldest message
+        st_session_state.chat_history = deque(maxlen=MAX_CHAT_HISTORY)
+    if 'chat_archive_count' not in st_session_state:
+        st_session_state.chat_archive_count = 0  # Messages dropped off the capped history
+    if 'chat_history_tail' not in st_session_state:
+        st_session_state.chat_history_tail = deque(
+            st_session_state.chat_history, maxlen=CHAT_CONTEXT_WINDOW
+        )
     if 'stage' not in st_session_state:
         st_session_state.stage = None
     if 'awaiting_confirmation' not in st_session_state:
@@ -140,9 +200,23 @@ def ensure_session_defaults(st_session_state):
         st_session_state.version = 0
 
 
+@lru_cache(maxsize=16)
+def _zone(tz_name: str) -> ZoneInfo:
+    """ZoneInfo for tz_name, looked up once per name."""
+    return ZoneInfo(tz_name)
+
+
 def get_tz(st_session_state) -> ZoneInfo:
     """Get current timezone as ZoneInfo object."""
-    return ZoneInfo(st_session_state.get("tz_name", "America/Phoenix"))
+    return _zone(st_session_state.get("tz_name", "America/Phoenix"))
+
+
+def tz_choices(current_tz: str) -> tuple[tuple[str, ...], int]:
+    """Selector options and the index of current_tz, prepending it if it isn't listed."""
+    index = _TZ_OPTION_INDEX.get(current_tz)
+    if index is None:
+        return (current_tz,) + TZ_OPTIONS, 0
+    return TZ_OPTIONS, index
 
 
 def now_local(st_session_state) -> datetime:
@@ -192,7 +266,7 @@ def add_schedule(st_session_state, title: str, date_str: str, start_time: str,
         'created_at': now_local(st_session_state).isoformat()
     }
 
-    st_session_state.schedules.append(entry)
+    insort(st_session_state.schedules, entry, key=schedule_sort_key)
     st_session_state.version += 1
 
     # Save to persistent storage
@@ -213,9 +287,14 @@ def update_schedule(st_session_state, schedule_id: str, changes: dict) -> bool:
     Returns:
         True if updated, False if not found
     """
-    for schedule in st_session_state.schedules:
+    schedules = st_session_state.schedules
+    for i, schedule in enumerate(schedules):
         if schedule['id'] == schedule_id:
             schedule.update(changes)
+            if 'date' in changes or 'start_time' in changes:
+                # Re-seat the entry to keep the list sorted
+                del schedules[i]
+                insort(schedules, schedule, key=schedule_sort_key)
             st_session_state.version += 1
             # Save to persistent storage
             save_schedules(st_session_state.schedules)
@@ -251,67 +330,172 @@ def mark_complete(st_session_state, schedule_id: str) -> bool:
     return update_schedule(st_session_state, schedule_id, {'completed': True})
 
 
-def get_today_schedules(st_session_state) -> list[dict]:
-    """Get schedules for today."""
-    today_iso = today_local(st_session_state).isoformat()
-    return [s for s in st_session_state.schedules if s['date'] == today_iso]
+@dataclass
+class ScheduleIndex:
+    """Schedules pre-grouped for the task views and analytics."""
+    by_date: dict[str, list[dict]]  # ISO date -> tasks sorted by start time
+    today: list[dict]               # Today's tasks sorted by start time
+    week: dict[date, list[dict]]    # This week's days, in date order
+    type_counts: Counter            # Task type -> count
+    completed_count: int
+
 
+def build_schedule_index(schedules: list[dict], today: date) -> ScheduleIndex:
+    """
+    Group schedules by date in one pass.
+
+    Args:
+        schedules: All schedule entries, sorted by schedule_sort_key so each
+            day's bucket comes out in start-time order
+        today: Today's date in the user's timezone
+
+    Returns:
+        ScheduleIndex for rendering today/week/calendar views and analytics
+    """
+    by_date = defaultdict(list)
+    type_counts = Counter()
+    completed_count = 0
+    for s in schedules:
+        by_date[s['date']].append(s)
+        type_counts[s['type']] += 1
+        if s['completed']:
+            completed_count += 1
 
-def get_week_schedules(st_session_state) -> list[dict]:
-    """Get schedules for current week."""
-    today = today_local(st_session_state)
     start_week = today - timedelta(days=today.weekday())
-    end_week = start_week + timedelta(days=6)
-    
-    week_schedules = []
-    for s in st_session_state.schedules:
-        try:
-            schedule_date = datetime.fromisoformat(s['date']).date()
-            if start_week <= schedule_date <= end_week:
-                week_schedules.append(s)
-        except:
-            continue
-    
-    return week_schedules
+    week = {}
+    for i in range(7):
+        day = start_week + timedelta(days=i)
+        day_iso = day.isoformat()
+        if day_iso in by_date:
+            week[day] = by_date[day_iso]
+
+    return ScheduleIndex(
+        by_date=dict(by_date),
+        today=by_date.get(today.isoformat(), []),
+        week=week,
+        type_counts=type_counts,
+        completed_count=completed_count
+    )
 
 
-def format_schedule_display(schedule: dict) -> str:
-    """Format a schedule entry for display."""
-    event_type_emoji = {
-        'work': '💼',
-        'meeting': '🤝',
-        'personal': '🏃',
-        'break': '☕'
-    }
-    
-    emoji = event_type_emoji.get(schedule.get('type', 'work'), '📅')
-    status = "✅" if schedule.get('completed') else "⏰"
-    
+def _schedule_time_str(schedule: dict) -> str:
+    """'09:00 - 10:00' (or '09:00 (60 min)') for a schedule entry."""
     time_str = schedule.get('start_time', '??:??')
     if schedule.get('end_time'):
         time_str += f" - {schedule['end_time']}"
     elif schedule.get('duration'):
         time_str += f" ({schedule['duration']} min)"
-    
-    return f"{status} {emoji} **{schedule['title']}** - {time_str}"
+    return time_str
+
+
+@lru_cache(maxsize=1024)
+def _row_text(title: str, event_type: str, start_time, end_time, duration) -> tuple[str, str]:
+    """(task, time) cells for a schedule; tasks rarely change, so rerenders hit the cache."""
+    emoji = TYPE_EMOJI.get(event_type, '📅')
+    time_str = _schedule_time_str(
+        {'start_time': start_time, 'end_time': end_time, 'duration': duration}
+    )
+    return f"{emoji} {title}", time_str
+
+
+def format_schedule_row(schedule: dict) -> dict:
+    """Format a schedule entry as a row for the task list editor."""
+    task, time_str = _row_text(
+        schedule['title'],
+        schedule.get('type', 'work'),
+        schedule.get('start_time', '??:??'),
+        schedule.get('end_time'),
+        schedule.get('duration'),
+    )
+    return {
+        'completed': bool(schedule.get('completed')),
+        'task': task,
+        'time': time_str,
+    }
+
+
+def get_schedule_index(st_session_state, today: date) -> ScheduleIndex:
+    """Get the session's ScheduleIndex, rebuilt only when the schedules or the day change."""
+    # Kept in session state, not a global cache: no copy per rerun, no cross-session entries
+    key = (st_session_state.version, today)
+    cached = st_session_state.get('index_cache')
+    if cached and cached[0] == key:
+        return cached[1]
+
+    index = build_schedule_index(st_session_state.schedules, today)
+    st_session_state.index_cache = (key, index)
+    return index
 
 
 def schedules_snapshot_sorted(st_session_state) -> list[dict]:
     """Get sorted snapshot of all schedules for passing to bots."""
-    return sorted(
-        st_session_state.schedules,
-        key=lambda x: (x.get('date', ''), x.get('start_time', ''))
-    )
+    # Schedules are kept sorted; copy once per version so bots get a stable list
+    cached = st_session_state.get('snapshot_cache')
+    if cached and cached[0] == st_session_state.version:
+        return cached[1]
+
+    snapshot = list(st_session_state.schedules)
+    st_session_state.snapshot_cache = (st_session_state.version, snapshot)
+    return snapshot
+
+
+def schedules_between(sorted_schedules: list[dict], start_iso: str, end_iso: str) -> list[dict]:
+    """
+    Slice schedules dated start_iso..end_iso (inclusive) by binary search.
+
+    Args:
+        sorted_schedules: Schedules sorted by date (see schedules_snapshot_sorted)
+        start_iso: First ISO date to include
+        end_iso: Last ISO date to include
+
+    Returns:
+        Schedules in the range, in their sorted order
+    """
+    date_key = lambda s: s.get('date', '')
+    lo = bisect_left(sorted_schedules, start_iso, key=date_key)
+    hi = bisect_right(sorted_schedules, end_iso, lo=lo, key=date_key)
+    return sorted_schedules[lo:hi]
+
+
+def message_html(role: str, text: str) -> str:
+    """Render a chat message as the HTML bubble shown in the chat panel."""
+    escaped = html.escape(text, quote=False)
+    if role == 'user':
+        return f'<div class="user-message">{escaped}</div>'
+    content = _BOLD_RE.sub(r'<strong>\1</strong>', escaped) if '**' in escaped else escaped
+    return f'<div class="bot-message">{content}</div>'
 
 
 def push_user(st_session_state, text: str):
     """Add user message to chat history."""
-    st_session_state.chat_history.append({'role': 'user', 'content': text})
+    _push_message(st_session_state, 'user', text)
 
 
 def push_bot(st_session_state, text: str):
     """Add bot message to chat history."""
-    st_session_state.chat_history.append({'role': 'bot', 'content': text})
+    _push_message(st_session_state, 'bot', text)
+
+
+def recent_chat(st_session_state) -> list[dict]:
+    """The last CHAT_CONTEXT_WINDOW messages, oldest first."""
+    return list(st_session_state.chat_history_tail)
+
+
+def clear_chat(st_session_state):
+    """Empty the chat history and its recent-message tail."""
+    st_session_state.chat_history.clear()
+    st_session_state.chat_history_tail.clear()
+    st_session_state.chat_archive_count = 0
+
+
+def _push_message(st_session_state, role: str, text: str):
+    """Append a message to the history and the bounded recent-message tail."""
+    msg = {'role': role, 'content': text, 'html': message_html(role, text)}
+    history = st_session_state.chat_history
+    if len(history) == MAX_CHAT_HISTORY:
+        st_session_state.chat_archive_count += 1  # The deque drops its oldest entry
+    history.append(msg)
+    st_session_state.chat_history_tail.append(msg)
 
 
 def set_confirmation(st_session_state, proposal: dict, stage: str):
@@ -327,24 +511,22 @@ def clear_confirmation(st_session_state):
     st_session_state.last_proposal = None
 
 
-def parse_corrective_info(st_session_state, user_text: str, current_proposal: dict) -> Optional[dict]:
+def parse_corrective_info(st_session_state, user_text: str, current_proposal: dict, llm=None) -> Optional[dict]:
     """
     Parse corrective information from user's response using LLM.
 
     Args:
-        st_session_state: Session state containing LLM instance
+        st_session_state: Session state (for today's date)
         user_text: User's corrective message
         current_proposal: Current proposal being confirmed
+        llm: Shared LLM instance; without one no corrections are parsed
 
     Returns:
         Dictionary with updated fields, or None if no corrections detected
     """
-    # Import LLM from session state (it's initialized in app.py)
-    if not hasattr(st_session_state, 'llm'):
+    if llm is None:
         return None
 
-    llm = st_session_state.llm
-
     system_instruction = """You are a smart assistant helping to parse corrective information from user messages.
 When a user is being asked to confirm a plan and they provide corrective information instead of yes/no,
 extract what they want to change.
@@ -426,10 +608,11 @@ def update_proposal_with_corrections(current_proposal: dict, corrections: dict)
     return updated
 
 
-def try_handle_confirmation(st_session_state, user_text: str) -> bool:
+def try_handle_confirmation(st_session_state, user_text: str, llm=None) -> bool:
     """
     Try to handle user confirmation response.
-    Intelligently detects yes/no responses as well as corrective information.
+    Intelligently detects yes/no responses as well as corrective information
+    (the latter needs the shared LLM instance passed as llm).
 
     Returns:
         True if confirmation was handled, False otherwise
@@ -440,8 +623,7 @@ def try_handle_confirmation(st_session_state, user_text: str) -> bool:
     text_lower = user_text.strip().lower()
 
     # Positive confirmations
-    yes_tokens = ["yes", "y", "ok", "okay", "save", "confirm", "sure", "yep", "yeah", "👍", "✅"]
-    if any(text_lower.startswith(token) for token in yes_tokens):
+    if text_lower.startswith(YES_PREFIXES):
         proposal = st_session_state.last_proposal
         stage = st_session_state.stage
 
@@ -473,15 +655,14 @@ def try_handle_confirmation(st_session_state, user_text: str) -> bool:
         return True
 
     # Negative confirmations
-    no_tokens = ["no", "n", "cancel", "nope", "nah", "nevermind", "👎", "❌"]
-    if any(text_lower.startswith(token) for token in no_tokens):
+    if text_lower.startswith(NO_PREFIXES):
         push_bot(st_session_state, "No problem! Discarded. What would you like to do instead?")
         clear_confirmation(st_session_state)
         return True
 
     # Smart handling: Check if user is providing corrective information
     # instead of just yes/no
-    corrections = parse_corrective_info(st_session_state, user_text, st_session_state.last_proposal)
+    corrections = parse_corrective_info(st_session_state, user_text, st_session_state.last_proposal, llm)
 
     if corrections:
         # User provided corrective information - update the proposal and re-confirm
@@ -494,8 +675,7 @@ def try_handle_confirmation(st_session_state, user_text: str) -> bool:
         st_session_state.last_proposal = updated_proposal
 
         # Generate new confirmation message
-        from datetime import datetime
-        date_obj = datetime.fromisoformat(updated_proposal['date']).date()
+        date_obj = parse_iso_date(updated_proposal['date'])
         friendly_date = date_obj.strftime("%A, %B %d, %Y")
 
         confirmation_msg = f"Got it! Updated to **{updated_proposal['title']}** on {friendly_date} from {updated_proposal['start_time']} to {updated_proposal['end_time']} ({updated_proposal['duration']} minutes). Save this?"
@@ -4,11 +4,60 @@ Time parsing utilities for TimeBuddy.
 Extracts dates, times, and durations from natural language.
 """
 import re
+from functools import lru_cache
 from datetime import datetime, date, timedelta
 from typing import Optional, Tuple
 import dateparser
 
 
+# Patterns are compiled once at import; these helpers run on every chat turn.
+
+# parse_time_of_day (input is upper-cased first)
+_TIME_HM_AMPM_RE = re.compile(r'(\d{1,2}):(\d{2})\s*(AM|PM)')
+_TIME_H_AMPM_RE = re.compile(r'(\d{1,2})\s*(AM|PM)')
+_TIME_HM_RE = re.compile(r'(\d{1,2}):(\d{2})')
+_TIME_H_RE = re.compile(r'\b(\d{1,2})\b')
+
+# infer_date: day names in one scan (substring match, as before), indexed Monday=0
+_WEEKDAY_NAMES = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+_WEEKDAY_INDEX = {name: i for i, name in enumerate(_WEEKDAY_NAMES)}
+_WEEKDAY_RE = re.compile('|'.join(_WEEKDAY_NAMES))
+
+# infer_date: explicit YYYY-MM-DD dates skip dateparser
+_ISO_DATE_RE = re.compile(r'\b(\d{4}-\d{2}-\d{2})\b')
+
+# parse_duration_minutes
+_DURATION_HOURS_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(?:hours?|hrs?|h)\b', re.IGNORECASE)
+_DURATION_MINUTES_RE = re.compile(r'(\d+)\s*(?:minutes?|mins?|m)\b', re.IGNORECASE)
+
+# quick_task_title_guess: time/duration phrases, in removal order, with their replacements
+_TITLE_TIME_RES = (
+    # Complete time expressions with "at" (before removing individual parts):
+    # "at 7am", "at 7:30pm", "at 14:00", etc.
+    (re.compile(r'\bat\s+\d{1,2}:\d{2}\s*(?:am|pm)?', re.IGNORECASE), ''),
+    (re.compile(r'\bat\s+\d{1,2}\s*(?:am|pm)?', re.IGNORECASE), ''),  # Made am/pm optional
+    (re.compile(r'\bat\s+\d{1,2}(?:\s|$)'), ' '),  # "at 7 " or "at 7" at end
+    # Duration expressions with "for" (before removing standalone durations)
+    (re.compile(r'\bfor\s+\d+(?:\.\d+)?\s*(?:hours?|hrs?|h)\b', re.IGNORECASE), ''),
+    (re.compile(r'\bfor\s+\d+\s*(?:minutes?|mins?|m)\b', re.IGNORECASE), ''),
+    # Standalone time expressions (any leftover time patterns)
+    (re.compile(r'\b\d{1,2}:\d{2}\s*(?:am|pm)?', re.IGNORECASE), ''),
+    (re.compile(r'\b\d{1,2}\s*(?:am|pm)\b', re.IGNORECASE), ''),
+    # Standalone duration expressions
+    (re.compile(r'\b\d+(?:\.\d+)?\s*(?:hours?|hrs?|h)\b', re.IGNORECASE), ''),
+    (re.compile(r'\b\d+\s*(?:minutes?|mins?|m)\b', re.IGNORECASE), ''),
+    # Any leftover am/pm markers
+    (re.compile(r'\b(?:am|pm)\b', re.IGNORECASE), ''),
+)
+_TITLE_DAY_NAME_RE = re.compile(
+    r'\b(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday'
+    r'|mon|tue|wed|thu|fri|sat|sun)\b',
+    re.IGNORECASE
+)
+_NUMBER_RE = re.compile(r'\b\d+\b')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
 def parse_time_of_day(text: str) -> Optional[str]:
     """
     Parse time from text, return in HH:MM format.
@@ -21,7 +70,7 @@ def parse_time_of_day(text: str) -> Optional[str]:
     text = text.strip().upper()
     
     # Try HH:MM AM/PM
-    match = re.search(r'(\d{1,2}):(\d{2})\s*(AM|PM)', text)
+    match = _TIME_HM_AMPM_RE.search(text)
     if match:
         h, m, ampm = match.groups()
         h = int(h)
@@ -32,7 +81,7 @@ def parse_time_of_day(text: str) -> Optional[str]:
         return f"{h:02d}:{m}"
     
     # Try H AM/PM (no minutes)
-    match = re.search(r'(\d{1,2})\s*(AM|PM)', text)
+    match = _TIME_H_AMPM_RE.search(text)
     if match:
         h, ampm = match.groups()
         h = int(h)
@@ -43,7 +92,7 @@ def parse_time_of_day(text: str) -> Optional[str]:
         return f"{h:02d}:00"
     
     # Try 24-hour format HH:MM
-    match = re.search(r'(\d{1,2}):(\d{2})', text)
+    match = _TIME_HM_RE.search(text)
     if match:
         h, m = match.groups()
         h = int(h)
@@ -52,7 +101,7 @@ def parse_time_of_day(text: str) -> Optional[str]:
             return f"{h:02d}:{m:02d}"
     
     # Try single number (assume 24-hour)
-    match = re.search(r'\b(\d{1,2})\b', text)
+    match = _TIME_H_RE.search(text)
     if match:
         h = int(match.group(1))
         if 0 <= h <= 23:
@@ -80,15 +129,23 @@ def infer_date(text: str, today_dt: date) -> str:
     if 'tomorrow' in text_lower:
         return (today_dt + timedelta(days=1)).isoformat()
     
-    # Day names
-    days = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-    for i, day_name in enumerate(days):
-        if day_name in text_lower:
-            days_ahead = i - today_dt.weekday()
-            if days_ahead <= 0:
-                days_ahead += 7
-            return (today_dt + timedelta(days=days_ahead)).isoformat()
-    
+    # Day names (earliest in the week wins when several are mentioned)
+    found = _WEEKDAY_RE.findall(text_lower)
+    if found:
+        i = min(_WEEKDAY_INDEX[day_name] for day_name in found)
+        days_ahead = i - today_dt.weekday()
+        if days_ahead <= 0:
+            days_ahead += 7
+        return (today_dt + timedelta(days=days_ahead)).isoformat()
+    
+    # Explicit ISO date: parse directly instead of going through dateparser
+    iso_match = _ISO_DATE_RE.search(text)
+    if iso_match:
+        try:
+            return date.fromisoformat(iso_match.group(1)).isoformat()
+        except ValueError:
+            pass  # Not a real calendar date; let dateparser try
+
     # Try dateparser for complex dates
     try:
         parsed = dateparser.parse(
@@ -117,13 +174,13 @@ def parse_duration_minutes(text: str) -> Optional[int]:
         "1.5 hours" -> 90
     """
     # Hours
-    match = re.search(r'(\d+(?:\.\d+)?)\s*(?:hours?|hrs?|h)\b', text, re.IGNORECASE)
+    match = _DURATION_HOURS_RE.search(text)
     if match:
         hours = float(match.group(1))
         return int(hours * 60)
     
     # Minutes
-    match = re.search(r'(\d+)\s*(?:minutes?|mins?|m)\b', text, re.IGNORECASE)
+    match = _DURATION_MINUTES_RE.search(text)
     if match:
         return int(match.group(1))
     
@@ -145,44 +202,26 @@ def quick_task_title_guess(text: str) -> str:
     for trigger in ['add', 'schedule', 'create', 'plan', 'book', 'set up', 'set', 'remind me to', 'reminder']:
         text = text.replace(trigger, '')
 
-    # Remove complete time expressions with "at" (do this before removing individual parts)
-    # "at 7am", "at 7:30pm", "at 14:00", etc.
-    text = re.sub(r'\bat\s+\d{1,2}:\d{2}\s*(?:am|pm)?', '', text, flags=re.IGNORECASE)
-    text = re.sub(r'\bat\s+\d{1,2}\s*(?:am|pm)?', '', text, flags=re.IGNORECASE)  # Made am/pm optional
-    text = re.sub(r'\bat\s+\d{1,2}(?:\s|$)', ' ', text)  # "at 7 " or "at 7" at end
-
-    # Remove duration expressions with "for" (do this before removing standalone durations)
-    text = re.sub(r'\bfor\s+\d+(?:\.\d+)?\s*(?:hours?|hrs?|h)\b', '', text, flags=re.IGNORECASE)
-    text = re.sub(r'\bfor\s+\d+\s*(?:minutes?|mins?|m)\b', '', text, flags=re.IGNORECASE)
-
-    # Remove standalone time expressions (any leftover time patterns)
-    text = re.sub(r'\b\d{1,2}:\d{2}\s*(?:am|pm)?', '', text, flags=re.IGNORECASE)
-    text = re.sub(r'\b\d{1,2}\s*(?:am|pm)\b', '', text, flags=re.IGNORECASE)
-
-    # Remove standalone duration expressions
-    text = re.sub(r'\b\d+(?:\.\d+)?\s*(?:hours?|hrs?|h)\b', '', text, flags=re.IGNORECASE)
-    text = re.sub(r'\b\d+\s*(?:minutes?|mins?|m)\b', '', text, flags=re.IGNORECASE)
-
-    # Remove any leftover am/pm markers
-    text = re.sub(r'\b(?:am|pm)\b', '', text, flags=re.IGNORECASE)
+    # Remove time, duration and am/pm expressions (see _TITLE_TIME_RES for the order)
+    for pattern, replacement in _TITLE_TIME_RES:
+        text = pattern.sub(replacement, text)
 
     # Remove date expressions
     for word in ['tomorrow', 'today', 'tonight', 'morning', 'afternoon', 'evening', 'next week', 'next monday', 'next tuesday', 'next wednesday', 'next thursday', 'next friday', 'next saturday', 'next sunday']:
         text = text.replace(word, '')
 
     # Remove day names
-    for day in ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday', 'mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']:
-        text = re.sub(r'\b' + day + r'\b', '', text, flags=re.IGNORECASE)
+    text = _TITLE_DAY_NAME_RE.sub('', text)
 
     # Remove leftover connector words and prepositions
     for connector in [' for ', ' at ', ' on ', ' from ', ' to ', ' by ', ' in ', ' the ']:
         text = text.replace(connector, ' ')
 
     # Remove any leftover standalone numbers
-    text = re.sub(r'\b\d+\b', '', text)
+    text = _NUMBER_RE.sub('', text)
 
     # Clean up extra whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = _WHITESPACE_RE.sub(' ', text).strip()
 
     if not text:
         return "New Task"
@@ -191,9 +230,12 @@ def quick_task_title_guess(text: str) -> str:
     return ' '.join(word.capitalize() for word in text.split())
 
 
+@lru_cache(maxsize=256)
 def parse_create_minimum(text: str, today_dt: date) -> Tuple[str, str, str, int]:
     """
     Parse minimum required fields for task creation.
+    Memoized per (text, today_dt): the result is an immutable tuple, and a
+    repeated or retried message skips the regex chain and dateparser.
     
     Returns:
         (title, date, start_time, duration)
@@ -0,0 +1,87 @@
+# core/ui.py
+"""
+Static UI text and labels for TimeBuddy.
+Kept out of app.py, which Streamlit re-executes on every rerun; an imported
+module is built once per process.
+"""
+from datetime import date
+
+
+# Event type -> colored dot for the compact calendar cells
+TYPE_EMOJI_CAL = {'work': '🔵', 'meeting': '🟡', 'personal': '🟢', 'break': '⚪'}
+
+# Task panel views
+VIEW_TODAY, VIEW_WEEK, VIEW_MONTH = "📋 Today", "📅 Week", "🗓️ Month"
+TASK_VIEWS = (VIEW_TODAY, VIEW_WEEK, VIEW_MONTH)
+
+# Calendar labels, indexed by date.weekday() / date.month, so headers skip strftime
+WEEKDAY_ABBR = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+MONTH_ABBR = ('', 'Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+              'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+
+def short_date(d: date) -> str:
+    """'Oct 05' style label, equivalent to d.strftime('%b %d')."""
+    return f"{MONTH_ABBR[d.month]} {d.day:02d}"
+
+
+# Help dialog content (static)
+HELP_TEXT = """
+### 🤖 About TimeBuddy
+
+**TimeBuddy** is your AI-powered personal time assistant built with a modular architecture.
+
+---
+
+### 📝 How to Use
+
+#### Creating Tasks:
+- "Add team meeting tomorrow at 2pm"
+- "Schedule workout at 7am for 1 hour"
+- "Set up lunch with Sarah on Friday at noon"
+
+#### Editing Tasks:
+- "Move my workout to 8am"
+- "Cancel the meeting"
+- "Change the team meeting to 3pm"
+
+#### Checking Schedule:
+- "Show me today's schedule"
+- "What's on this week?"
+- "Do I have anything tomorrow?"
+
+---
+
+### 🔧 Features
+
+- **Smart AI Routing**: Automatically routes your requests to specialized bots
+- **Natural Language**: Talk to TimeBuddy like a personal assistant
+- **Multi-timezone Support**: Work across different time zones seamlessly
+- **Task Management**: Create, edit, check, and complete tasks with ease
+- **Visual Calendar**: See your week at a glance
+
+---
+
+### ℹ️ System Information
+
+- **Version:** 2.0 (Modular Architecture)
+- **AI Engine:** Gemini AI
+- **Framework:** Streamlit
+- **Architecture:** Router + Specialized Bots (Create, Edit, Check, Other)
+"""
+
+# First message shown in an empty chat
+WELCOME_HTML = """
+<div class="bot-message">
+👋 Hi! I'm TimeBuddy, your personal time assistant. I can help you:
+
+• **Schedule tasks**: "Add team meeting tomorrow at 2pm"<br>
+• **Edit plans**: "Move my workout to 7am"<br>
+• **Check agenda**: "Show me today's schedule"
+
+What would you like to do?
+</div>
+"""
+
+# Messages drawn by default; older ones only when "show_older_chat" is on
+VISIBLE_CHAT_MESSAGES = 30